@@ -0,0 +1,23 @@
+-- Clears cause_list and loads the first batch of the day in one call/transaction
+-- (called by scripts/cause_list_parser.py; later batches use insert_cause_list_batch).
+-- Saves the separate truncate_cause_list round-trip, and a failed first batch now
+-- rolls back the TRUNCATE instead of leaving the table empty.
+--
+-- Needs truncate_cause_list.sql and insert_cause_list_batch to be installed first.
+create or replace function refresh_cause_list_batch(cases_data jsonb)
+returns table (inserted_count integer, updated_count integer)
+language plpgsql
+as $$
+begin
+    perform truncate_cause_list();
+    return query
+        select b.inserted_count::integer, b.updated_count::integer
+        from insert_cause_list_batch(cases_data) b;
+end;
+$$;
+
+-- Same restriction as truncate_cause_list: anon could otherwise clear the table and
+-- load its own rows in one call. Install after truncate_cause_list.sql and
+-- insert_cause_list_batch.
+revoke execute on function refresh_cause_list_batch(jsonb) from public, anon, authenticated;
+grant execute on function refresh_cause_list_batch(jsonb) to service_role;
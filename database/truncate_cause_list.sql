@@ -0,0 +1,18 @@
+-- Empties cause_list before the morning load (called by scripts/cause_list_parser.py).
+-- TRUNCATE releases the table's storage in one step instead of scanning, deleting
+-- and WAL-logging every row the way DELETE ... WHERE case_number <> '' does.
+--
+-- Runs with the caller's privileges, so the key used by the parser must be allowed
+-- to TRUNCATE cause_list (the service_role key is). TRUNCATE bypasses row-level
+-- security, and new functions are executable by PUBLIC, so execute is limited to
+-- service_role below. TRUNCATE also fails if another table has a foreign key to
+-- cause_list (DELETE did not).
+create or replace function truncate_cause_list()
+returns void
+language sql
+as $$
+    truncate table cause_list;
+$$;
+
+revoke execute on function truncate_cause_list() from public, anon, authenticated;
+grant execute on function truncate_cause_list() to service_role;
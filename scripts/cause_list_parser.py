@@ -6,16 +6,27 @@ Based on test20.py with Supabase integration
 
 import os
 import re
+import time
+import string
 from datetime import datetime, timezone, timedelta
 from supabase import create_client, Client
 from pypdf import PdfReader
-from io import BytesIO
+from io import BytesIO, StringIO
+from functools import lru_cache
+from itertools import repeat
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 import logging
 import httpx
 
 SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
 CAUSE_LIST_URL = "https://judiciary.karnataka.gov.in/pdfs/consolidatedCauselist/blrconsolidation.pdf"
+HTTP_WORKER_URL = "https://gthnjueqoufdtwtzjcxg.supabase.co/functions/v1/http-worker"
+RPC_BATCH_SIZE = 500  # Cases per refresh/insert_cause_list_batch call
+DOWNLOAD_ATTEMPTS = 3
+PDF_WORKERS = os.cpu_count() or 1  # Processes used for page text extraction
+MAX_GRAPHICS_STREAM_BYTES = 1_000_000  # Larger content streams with no text object are skipped
 # Constants for anchor-based parsing
 CASE_TYPES_LIST = [
     r"AC", r"AP\.EFA", r"AP\.IM", r"CA", r"CC\(CIA\)", r"CCC", r"CEA", r"CMP", r"COA",
@@ -28,20 +39,68 @@ CASE_TYPES_LIST = [
     r"RSA\.CROB", r"SCLAP", r"STA", r"STRP", r"TAET", r"TOS", r"TRC", r"WA", r"WA\.CROB",
     r"WP", r"WPCP", r"WPHC", r"WTA", r"EP"
 ] #EP added as its not present in casetypes.pdf after 28 its 30
-CASE_TYPES_REGEX = "|".join(CASE_TYPES_LIST)
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s',    handlers=[
-        logging.FileHandler('app.log'),  # Creates log file
-        logging.StreamHandler()  # Also logs to console
-    ])
+
+def build_prefix_regex(words):
+    """Merge words into one prefix-trie alternation that prefers the longest match"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # A word ends here
+
+    def render(node):
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if "" in node:
+            # Greedy optional suffix: the longest type wins, as the atomic group below requires
+            return "(?:%s)?" % "|".join(branches)
+        return branches[0] if len(branches) == 1 else "(?:%s)" % "|".join(branches)
+
+    return render(trie)
+
+
+# Prefix-merged so each position checks one character per level instead of
+# retrying all ~70 types (e.g. MFA.CROB and MFA share the MFA branch)
+CASE_TYPES_REGEX = build_prefix_regex(t.replace("\\", "") for t in CASE_TYPES_LIST)
+
+# Patterns are compiled once at import instead of on every call/page/case
+PDF_DATE_PATTERN = re.compile(
+    r"ON THE DAY OF .*? THE (\d+)(?:st|nd|rd|th)?\s+Day\s+Of\s+([A-Za-z]+)\s+(\d{4})",
+    re.IGNORECASE
+)
+BEFORE_PREFIX_PATTERN = re.compile(r'^BEFORE\s+', re.IGNORECASE)
+HONBLE_PATTERN = re.compile(r'THE\s+HON\'BLE\s+', re.IGNORECASE)
+CASE_NO_PATTERN = re.compile(r"([A-Z.]+\s+\d+[\d/\\]+)")
+# Page noise removed in one pass: website footer line, "Page x of y z" counter, "Connected With" markers
+PAGE_NOISE_PATTERN = re.compile(
+    r"Website:https://judiciary\.karnataka\.gov\.in.*?\n|"
+    r"Page \d+ of \d+ \d+|"
+    r"(?i:Connected With)"
+)
+# Advocate lines to skip; SD/VK are initials, so match them only as whole words ("AND OTHERS" is covered by OTHERS)
+ADVOCATE_SKIP_PATTERN = re.compile(r"OTHERS|NOT FILED|\bSD\b|\bVK\b")
+RES_HALL_PATTERN = re.compile(r"COURT\s+HALL\s+NO\s*[:]\s*(\w+)", re.IGNORECASE)
+RES_HALL_CLEANUP_PATTERN = re.compile(r"COURT\s+HALL\s+NO\s*:\s*\d+", re.IGNORECASE)
+# ASCII-only upper-casing keeps every character at the same index (str.upper() can
+# expand e.g. "ß" to "SS"), so match spans on the upper-cased copy slice the original
+UPPERCASE_ASCII = str.maketrans(string.ascii_lowercase, string.ascii_uppercase)
+# Combined pattern updated with Case Type anchors and decimal serial numbers.
+# Case-sensitive: it runs on the UPPERCASE_ASCII copy of the text
+COMBINED_PATTERN = re.compile(
+    r"(?:COURT\s+HALL\s+NO\s*[:]\s*(?P<hall>\w+))|" +  #Capture \w+ to support 2A
+    r"(?:CAUSE\s+LIST\s+NO\.\s*(?P<cause>.*?)\n)|" +    
+    r"(?P<judge>BEFORE\s+(?:THE\s+HON'BLE\s+(?:(?:DR\.|MRS\.|MS\.|CHIEF|[A-Z\.]{2,10})\s+)?JUSTICE|REGISTRAR).*?(?=\(TO GET))|" +
+    r"(?:^\s*(?P<sno>\d+(?:\.\d+)?)\s+(?P<case>(?>%s)\s+\d+.*?)\s+PET:\s*(?P<pet>.+?)\s+RES:\s*(?P<res>.+?)" % CASE_TYPES_REGEX +
+    r"(?=\n\s*(?:\d+(?:\.\d+)?\s+(?>%s)|CAUSE|BEFORE|---END---|$)))" % CASE_TYPES_REGEX,
+    re.MULTILINE | re.DOTALL
+)
 
 def extract_pdf_date(text):
     """Extracts date from 'ON THE DAY OF ... 23rd Day Of January 2026'"""
-    pattern = re.compile(
-        r"ON THE DAY OF .*? THE (\d+)(?:st|nd|rd|th)?\s+Day\s+Of\s+([A-Za-z]+)\s+(\d{4})", 
-        re.IGNORECASE
-    )
-    match = pattern.search(text)
+    match = PDF_DATE_PATTERN.search(text)
     if match:
         day, month, year = match.groups()
         date_str = f"{day} {month} {year}"
@@ -63,11 +122,27 @@ def is_date_already_processed(supabase, pdf_date):
     result = supabase.table('daily_summary').select('date').eq('date', pdf_date).execute()
     return len(result.data) > 0
 
+_supabase_client = None
+_worker_client = None
+
+def get_supabase_client():
+    """Return the shared Supabase client, creating it on first use"""
+    global _supabase_client
+    if _supabase_client is None:
+        _supabase_client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    return _supabase_client
+
+def get_worker_client():
+    """Return the shared client for the http-worker Edge Function"""
+    global _worker_client
+    if _worker_client is None:
+        _worker_client = create_client(HTTP_WORKER_URL, SUPABASE_KEY)
+        _worker_client.functions._client.timeout = httpx.Timeout(30.0)
+    return _worker_client
+
 def http_worker_call_to_supabase():
     try:
-        url: str = "https://gthnjueqoufdtwtzjcxg.supabase.co/functions/v1/http-worker"
-        supabase: Client = create_client(url, SUPABASE_KEY)
-        supabase.functions._client.timeout = httpx.Timeout(30.0)
+        supabase: Client = get_worker_client()
         response = supabase.functions.invoke(
             "http-worker",
             invoke_options={
@@ -83,185 +158,254 @@ def http_worker_call_to_supabase():
 
 
 def download_pdf(url):
-    """Download PDF from URL"""
+    """Download PDF from URL, retrying failed worker calls with exponential backoff"""
     try:
-        data = http_worker_call_to_supabase()
-        if data:
-            logging.info("PDF downloaded successfully")
-            return BytesIO(data)
+        for attempt in range(1, DOWNLOAD_ATTEMPTS + 1):
+            data = http_worker_call_to_supabase()
+            if data:
+                logging.info("PDF downloaded successfully")
+                return BytesIO(data)
+            if attempt < DOWNLOAD_ATTEMPTS:
+                delay = 2 ** attempt
+                logging.warning(f"PDF download attempt {attempt} failed, retrying in {delay}s")
+                time.sleep(delay)
         return None
     except Exception as e:
         logging.error(f"PDF download error: {e}")
         return None
 
+@lru_cache(maxsize=1024)
 def parse_judges(judge_line):
     """Parse judge names from BEFORE section"""
     # Remove 'BEFORE' prefix
-    text = re.sub(r'^BEFORE\s+', '', judge_line.strip(), flags=re.IGNORECASE)
+    text = BEFORE_PREFIX_PATTERN.sub('', judge_line.strip())
     # Remove all instances of 'THE HON'BLE' (handles both single and double judge lines)
-    text = re.sub(r'THE\s+HON\'BLE\s+', '', text, flags=re.IGNORECASE)
+    text = HONBLE_PATTERN.sub('', text)
     # Clean up extra whitespace and newlines
-    text = " ".join(text.split()).strip()
+    text = " ".join(text.split())
 
     return text if text else "N/A"
 
 
 def parse_case_details(raw_case_id):
     """Extract Case Type, Case No, and Details from case identifier"""
-    text = " ".join(raw_case_id.split()).strip()
+    text = " ".join(raw_case_id.split())
     case_type, case_no, case_details = "N/A", "N/A", "N/A"
 
     # Extract case type from parentheses at end
     if text.endswith(')'):
-        depth = 0
-        split_index = -1
-        for i in range(len(text) - 1, -1, -1):
-            if text[i] == ')': 
-                depth += 1
-            elif text[i] == '(': 
-                depth -= 1
-            if depth == 0:
-                split_index = i
-                break
-        if split_index != -1:
+        split_index = text.rfind('(')
+        # Fast path: no ')' between the last '(' and the closing one, so they pair up.
+        # Nested types such as "(CC(CIA))" fall back to the depth scan below.
+        if split_index != -1 and text.find(')', split_index) == len(text) - 1:
             case_type = text[split_index + 1 : -1].strip()
             text = text[:split_index].strip()
+        else:
+            split_index = -1
+            depth = 0
+            for i in range(len(text) - 1, -1, -1):
+                if text[i] == ')': 
+                    depth += 1
+                elif text[i] == '(': 
+                    depth -= 1
+                if depth == 0:
+                    split_index = i
+                    break
+            if split_index != -1:
+                case_type = text[split_index + 1 : -1].strip()
+                text = text[:split_index].strip()
 
     # Extract case number
-    no_match = re.search(r"([A-Z.]+\s+\d+[\d/\\]+)", text)
+    no_match = CASE_NO_PATTERN.search(text)
     if no_match:
         case_no = no_match.group(1).strip()
-        case_details = text.replace(case_no, "").strip() or "N/A"
+        # Cut the matched span out directly rather than searching the text for case_no again
+        case_details = (text[:no_match.start(1)] + text[no_match.end(1):]).strip() or "N/A"
     else:
         case_details = text or "N/A"
     
     return case_no, case_type, case_details
 
 
+@lru_cache(maxsize=8192)
 def extract_advocate(text):
     """Extract advocate name from petitioner/respondent text (last mixed-case line)"""
     if not text:
         return None
     
-    lines = [l.strip() for l in text.split('\n') if l.strip()]
+    # Strip each line once; blank lines drop out here
+    lines = [l for l in (raw.strip() for raw in text.split('\n')) if l]
     
     # Look for mixed-case lines (advocates are typically not all uppercase)
     for line in reversed(lines):
-        if not line or len(line) < 3:
+        if len(line) < 3:
             continue
         
-        # Skip all-uppercase lines (party names)
-        if line.isupper():
+        upper = line.upper()
+        # Skip all-uppercase lines (party names); lines without letters
+        # (serials, dates) are unchanged by upper() and are skipped too
+        if upper == line:
             continue
         
         # Skip common keywords
-        skip_keywords = ['AND OTHERS', 'OTHERS', 'NOT FILED', 'SD', 'VK']
-        if any(keyword in line.upper() for keyword in skip_keywords):
+        if ADVOCATE_SKIP_PATTERN.search(upper):
             continue
         
         # Found advocate
-        return line.strip()
+        return line
     
     return None
 
 
-def parse_pdf_to_cases(pdf_file):
-    """Parse PDF and extract all cases"""
-    reader = PdfReader(pdf_file)
-    full_document_text = []
-    
-    # Extract all text
-    for page in reader.pages:
-        page_text = page.extract_text()
-        # Clean footer
-        page_text = re.sub(r"Website:https://judiciary\.karnataka\.gov\.in.*?\n", "", page_text)
-        page_text = re.sub(r"Page \d+ of \d+ \d+", "", page_text)
-        full_document_text.append(page_text)
-
-    cleaned_text = "\n".join(full_document_text)
-    # Pre-clean: Remove footers that break multi-page cases and noise markers
-    cleaned_text = re.sub(r"Website:https://judiciary\.karnataka\.gov\.in.*?Page \d+ of \d+.*?\n", "", cleaned_text)
-    cleaned_text = re.sub(r"Connected With", "", cleaned_text, flags=re.IGNORECASE)
-    # check if the date is not the previous working day's!
-    pdf_date = extract_pdf_date(cleaned_text)
-    
+def clean_page_text(page_text):
+    """Remove page noise from one page of extracted text, ending it with a newline"""
+    # Terminate the page first so a footer on its last line is matched too
+    page_text += "\n"
+    # Remove footers that break multi-page cases and noise markers
+    # (none of them span a page boundary, so this is done per page)
+    page_text = PAGE_NOISE_PATTERN.sub("", page_text)
+    return page_text
+
+
+def extract_pypdf_page_text(page, page_index):
+    """Extract page text, skipping huge drawing-only content streams"""
+    contents = page.get_contents()
+    raw = contents.get_data() if contents else b""
+    # No BT (begin text) operator means nothing for extract_text to find
+    if len(raw) > MAX_GRAPHICS_STREAM_BYTES and b"BT" not in raw:
+        logging.warning(f"Skipping page {page_index + 1}: {len(raw)} byte content stream has no text")
+        return ""
+    return page.extract_text()
+
+
+def extract_page_range(pdf_bytes, start, stop, reader=None):
+    """Extract and clean pages [start, stop); runs inside a worker process"""
+    if reader is None:
+        reader = PdfReader(BytesIO(pdf_bytes))
+    pages = reader.pages
+    return [clean_page_text(extract_pypdf_page_text(pages[i], i)) for i in range(start, stop)]
+
+
+def iter_page_texts(pdf_bytes, reader, start=0):
+    """Yield cleaned page texts from page `start` on, in page order, extracting page ranges in parallel"""
+    page_count = len(reader.pages)
+    workers = max(1, min(PDF_WORKERS, page_count - start))
+    if workers == 1:
+        # Reuse the caller's reader instead of parsing the PDF again
+        yield from extract_page_range(pdf_bytes, start, page_count, reader)
+        return
+
+    # One contiguous range per worker; map() returns them in submission order
+    step = -(-(page_count - start) // workers)
+    starts = list(range(start, page_count, step))
+    stops = [min(range_start + step, page_count) for range_start in starts]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for page_texts in pool.map(extract_page_range, repeat(pdf_bytes), starts, stops):
+            yield from page_texts
+
+
+def group_text(text, match, name):
+    """Slice a named group out of the original-case text the match was made against"""
+    return text[match.start(name):match.end(name)]
+
+
+def check_pdf_date(pdf_date):
+    """Date guard: returns False (turning the system OFF) when this PDF must not be processed"""
     try:
-        supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+        supabase: Client = get_supabase_client()
         # Get today's date in IST (India Standard Time)
         ist_now = datetime.now(timezone(timedelta(hours=5, minutes=30)))
         today_date = ist_now.strftime('%Y-%m-%d')
 
-        if pdf_date:
-            logging.info(f"PDF Date found: {pdf_date} | Today's Date (IST): {today_date}")
+        logging.info(f"PDF Date found: {pdf_date} | Today's Date (IST): {today_date}")
+        
+        # Condition 1: Mismatch (Old or Future date)
+        if pdf_date != today_date:
+            reason = f"Date mismatch: PDF ({pdf_date}) is not Today ({today_date}). likely holiday/early preparation."
+            logging.warning(reason)
+            toggle_system_switch(supabase, False, reason)
+            return False
+            
+        # Condition 2: Already processed (Idempotency check)
+        elif is_date_already_processed(supabase, pdf_date):
+            logging.warning(f"Cause list for {pdf_date} already exists in database. Turning system OFF.")
+            toggle_system_switch(supabase, False, f"Date {pdf_date} already processed.")
+            return False
+            
+        # Condition 3: Match and New
+        else:
+            logging.info("VALID DATE DETECTED. Turning system ON.")
+            toggle_system_switch(supabase, True, f"Processing Cause List for {pdf_date}")
             
-            # Condition 1: Mismatch (Old or Future date)
-            if pdf_date != today_date:
-                reason = f"Date mismatch: PDF ({pdf_date}) is not Today ({today_date}). likely holiday/early preparation."
-                logging.warning(reason)
-                toggle_system_switch(supabase, False, reason)
-                return # Exit script
-                
-            # Condition 2: Already processed (Idempotency check)
-            elif is_date_already_processed(supabase, pdf_date):
-                logging.warning(f"Cause list for {pdf_date} already exists in database. Turning system OFF.")
-                toggle_system_switch(supabase, False, f"Date {pdf_date} already processed.")
-                return # Exit script
-                
-            # Condition 3: Match and New
-            else:
-                logging.info("VALID DATE DETECTED. Turning system ON.")
-                toggle_system_switch(supabase, True, f"Processing Cause List for {pdf_date}")
-                
     except Exception as e:
         logging.error(f"Supabase date validation error: {e}")
+    return True
 
-    # State tracking
-    current_hall, current_cause_list, current_judges = "N/A", "N/A", "N/A"
-    all_cases = []
-    date_str = datetime.now().strftime('%Y-%m-%d')
 
-    # Combined pattern updated with Case Type anchors and decimal serial numbers
-    combined_pattern = re.compile(
-        r"(?:COURT\s+HALL\s+NO\s*[:]\s*(\w+))|" +  #Capture \w+ to support 2A
-        r"(?:CAUSE\s+LIST\s+NO\.\s*(.*?)\n)|" +    
-        r"(BEFORE\s+(?:THE\s+HON'BLE\s+(?:(?:DR\.|MRS\.|MS\.|CHIEF|[A-Z\.]{2,10})\s+)?JUSTICE|REGISTRAR).*?(?=\(To get))|" +
-        r"(?:^\s*(\d+(?:\.\d+)?)\s+((?:%s)\s+\d+.*?)\s+PET:\s*(.+?)\s+RES:\s*(.+?)" % CASE_TYPES_REGEX +
-        r"(?=\n\s*(?:\d+(?:\.\d+)?\s+(?:%s)|CAUSE|BEFORE|---END---|$)))" % CASE_TYPES_REGEX,
-        re.MULTILINE | re.IGNORECASE | re.DOTALL
-    )
-    matches = combined_pattern.findall(cleaned_text)
+def parse_pdf_to_cases(pdf_file):
+    """Parse PDF and extract all cases"""
+    pdf_bytes = pdf_file.getvalue()
+    reader = PdfReader(BytesIO(pdf_bytes))
+    # check if the date is not the previous working day's! The date is in the page 1
+    # header, so holiday/duplicate runs stop before the rest of the PDF is extracted
+    first_page = extract_page_range(pdf_bytes, 0, min(1, len(reader.pages)), reader)
+    pdf_date = extract_pdf_date("".join(first_page))
+    if pdf_date and not check_pdf_date(pdf_date):
+        return # Exit script
+
+    # Cases can continue across page breaks, so the combined pattern needs the whole document
+    buffer = StringIO()
+    buffer.writelines(first_page)
+    for page_text in iter_page_texts(pdf_bytes, reader, start=len(first_page)):
+        buffer.write(page_text)
+    cleaned_text = buffer.getvalue()
+    if not pdf_date:
+        # Header not found on page 1: fall back to searching the whole document
+        pdf_date = extract_pdf_date(cleaned_text)
+        if pdf_date and not check_pdf_date(pdf_date):
+            return # Exit script
+
+    date_str = datetime.now().strftime('%Y-%m-%d')
     # State tracking
     current_hall, current_cause_list, current_judges = "0", "0", "N/A"
     orphans = []  # List for Hall-less cases found at the start of a page
     all_cases = []
  
-    for match in matches:
-        hall, cause_no, judge_line, sno, raw_case_id, pet, res = match
+    for m in COMBINED_PATTERN.finditer(cleaned_text.translate(UPPERCASE_ASCII)):
+        # lastgroup names the branch that matched (a case match ends with its 'res' group)
+        kind = m.lastgroup
 
-        if hall:
-            current_hall = hall.strip()
+        if kind == "hall":
+            current_hall = group_text(cleaned_text, m, "hall").strip()
             # ONLY Backfill court_hall for cases found before the hall was matched
             for orphan in orphans:
                 orphan['court_hall'] = current_hall
             orphans = []
             logging.info(f"Processing Court Hall {current_hall}")
-        elif cause_no:
-            current_cause_list = cause_no.strip()
-        elif judge_line:
-            current_judges = parse_judges(judge_line)
+        elif kind == "cause":
+            cause_no = group_text(cleaned_text, m, "cause")
+            if cause_no:  # An empty list number keeps the previous one
+                current_cause_list = cause_no.strip()
+        elif kind == "judge":
+            current_judges = parse_judges(group_text(cleaned_text, m, "judge"))
             logging.info(f"  Judges: {current_judges}")
-        elif sno:
+        else:
+            sno = group_text(cleaned_text, m, "sno")
+            pet = group_text(cleaned_text, m, "pet")
+            res = group_text(cleaned_text, m, "res")
             # 1. Search for hall footer in RES string (Pattern 1 behavior)
-            res_hall_match = re.search(r"COURT\s+HALL\s+NO\s*[:]\s*(\w+)", res, re.I)
+            res_hall_match = RES_HALL_PATTERN.search(res)
             if res_hall_match:
                 current_hall = res_hall_match.group(1).strip()
                 for orphan in orphans:
                     orphan['court_hall'] = current_hall
                 orphans = []
-            # 2. Clean RES: Remove the footer hall info if it was captured
-            res = re.sub(r"COURT\s+HALL\s+NO\s*:\s*\d+", "", res, flags=re.IGNORECASE).strip()
+                # 2. Clean RES: Remove the footer hall info that was captured
+                # (the cleanup can only match where the search above did)
+                res = RES_HALL_CLEANUP_PATTERN.sub("", res)
+            res = res.strip()
             # Parse case details
-            case_no, case_type, case_details = parse_case_details(raw_case_id)
+            case_no, case_type, case_details = parse_case_details(group_text(cleaned_text, m, "case"))
             
             # Extract advocates TODO
             #pet_adv = extract_advocate(pet)
@@ -285,7 +429,8 @@ def parse_pdf_to_cases(pdf_file):
             if current_hall == "0":
                 orphans.append(case_record)
 
-            logging.debug(f"  [{sno}] {case_no}")
+            # %-style args: the message is only formatted if DEBUG is enabled
+            logging.debug("  [%s] %s", sno, case_no)
 
     logging.info(f"Total cases parsed: {len(all_cases)}")
     return all_cases
@@ -298,22 +443,30 @@ def insert_to_supabase(cases):
         return
     
     try:
-        supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-
-        # Delete all existing rows from cause_list table (daily fresh start)
-        logging.info("Clearing cause_list table for today's data...")
-        supabase.table('cause_list').delete().neq('case_number', '').execute()
-        logging.info("Previous cause_list data cleared")
-
+        supabase: Client = get_supabase_client()
+
+        logging.info(f"Calling RPC function with {len(cases)} cases in batches of {RPC_BATCH_SIZE}...")
+        inserted, updated, has_stats = 0, 0, False
+        # Sent one batch at a time: concurrent batches could upsert the same case_number
+        for start in range(0, len(cases), RPC_BATCH_SIZE):
+            batch = cases[start:start + RPC_BATCH_SIZE]
+            # The first batch also clears yesterday's rows (daily fresh start) in the same call
+            rpc_name = 'refresh_cause_list_batch' if start == 0 else 'insert_cause_list_batch'
+            try:
+                result = supabase.rpc(rpc_name, {'cases_data': batch}).execute()
+            except Exception as e:
+                logging.error(f"Batch {start // RPC_BATCH_SIZE + 1} ({rpc_name}) failed for cases "
+                              f"{start + 1}-{start + len(batch)} of {len(cases)}: {e}")
+                if start:
+                    logging.error(f"cause_list is incomplete: only the first {start} cases were loaded")
+                raise
+            if result.data and len(result.data) > 0:
+                stats = result.data[0]
+                inserted += stats.get('inserted_count', 0)
+                updated += stats.get('updated_count', 0)
+                has_stats = True
         
-        logging.info(f"Calling RPC function with {len(cases)} cases...")
-        result = supabase.rpc('insert_cause_list_batch', {'cases_data': cases}).execute()
-        
-        if result.data and len(result.data) > 0:
-            stats = result.data[0]
-            inserted = stats.get('inserted_count', 0)
-            updated = stats.get('updated_count', 0)
-            
+        if has_stats:
             logging.info(f"Database operation completed:")
             logging.info(f"  - Inserted: {inserted} new cases")
             logging.info(f"  - Updated: {updated} existing cases")
@@ -322,19 +475,16 @@ def insert_to_supabase(cases):
             logging.info(f"Processed {len(cases)} cases")
         
         # Log summary
-        from collections import defaultdict
-        hall_counts = defaultdict(int)
+        hall_counts = Counter(case['court_hall'] for case in cases if case['court_hall'])
         
-        for case in cases:
-            if case['court_hall']:
-                hall_counts[case['court_hall']] += 1
-        
-        logging.info("\nCases by court hall:")
-        for hall, count in sorted(hall_counts.items()):
-            logging.info(f"  Court Hall {hall}: {count} cases")
+        # One multi-line record instead of a log call (and file/console write) per hall
+        summary = "\n".join(f"  Court Hall {hall}: {count} cases" for hall, count in sorted(hall_counts.items()))
+        logging.info(f"\nCases by court hall:\n{summary}")
         
     except Exception as e:
         logging.error(f"Supabase RPC error: {e}")
+        # Fail the run (and the workflow) rather than report success on a partial list
+        raise
 
 
 def main():
@@ -359,4 +509,10 @@ def main():
 
 
 if __name__ == "__main__":
+    # Configure logging only when run as a script, so importing a module doesn't
+    # open app.log or attach handlers
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s', handlers=[
+        logging.FileHandler('app.log'),  # Creates log file
+        logging.StreamHandler()  # Also logs to console
+    ])
     main()
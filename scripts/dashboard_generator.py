@@ -5,7 +5,10 @@ Generates static HTML dashboard from EOD data
 """
 
 import os
-from datetime import datetime, timedelta
+import json
+from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
 from supabase import create_client, Client
 import logging
 
@@ -13,11 +16,6 @@ SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
 TRACKING_START_DATE = "2026-01-02"  # When we started tracking
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s',    handlers=[
-        logging.FileHandler('app.log'),  # Creates log file
-        logging.StreamHandler()  # Also logs to console
-        ])
-
 
 def generate_dashboard():
     """Generate HTML dashboard with court statistics"""
@@ -34,12 +32,19 @@ def generate_dashboard():
         
         latest_date = latest.data[0]['date']
         
-        # Fetch data
-        daily_summary = get_daily_summary(supabase, latest_date)
-        judge_stats = get_judge_statistics(supabase, latest_date)
-        weekly_trend = get_weekly_trend(supabase)
-        monthly_stats = get_monthly_stats(supabase)
-        top_judges = get_top_judges_monthly(supabase)
+        # Fetch data (independent reads, so they run concurrently on the shared client)
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            daily_future = executor.submit(get_daily_summary, supabase, latest_date)
+            judges_future = executor.submit(get_judge_statistics, supabase, latest_date)
+            weekly_future = executor.submit(get_weekly_trend, supabase)
+            monthly_future = executor.submit(get_monthly_stats, supabase)
+            top_judges_future = executor.submit(get_top_judges_monthly, supabase)
+
+        daily_summary = daily_future.result()
+        judge_stats = judges_future.result()
+        weekly_trend = weekly_future.result()
+        monthly_stats = monthly_future.result()
+        top_judges = top_judges_future.result()
         
         # Generate HTML
         html = generate_html(
@@ -65,33 +70,36 @@ def generate_dashboard():
         raise
 
 
-def get_daily_summary(supabase, date):
+def get_daily_summary(supabase, date_str):
     """Get daily summary for specific date"""
-    result = supabase.table('daily_summary').select('*').eq('date', date).execute()
+    result = supabase.table('daily_summary').select('total_scheduled,total_heard,overall_efficiency').eq('date', date_str).execute()
     return result.data[0] if result.data else None
 
 
-def get_judge_statistics(supabase, date):
+def get_judge_statistics(supabase, date_str):
     """Get judge statistics for specific date"""
-    result = supabase.table('judge_statistics').select('*').eq('date', date).order('hearing_efficiency', desc=True).execute()
+    # Only the columns shown in the judge table
+    result = supabase.table('judge_statistics').select('judge_name,court_hall,cases_scheduled,cases_heard,cases_not_reached,hearing_efficiency').eq('date', date_str).order('hearing_efficiency', desc=True).execute()
     return result.data
 
 
 def get_weekly_trend(supabase):
     """Get last 7 days trend"""
-    end_date = datetime.now().date()
+    end_date = date.today()
     start_date = end_date - timedelta(days=6)
     
-    result = supabase.table('daily_summary').select('*').gte('date', str(start_date)).lte('date', str(end_date)).order('date').execute()
+    # The trend chart only plots efficiency per date
+    result = supabase.table('daily_summary').select('date,overall_efficiency').gte('date', start_date.isoformat()).lte('date', end_date.isoformat()).order('date').execute()
     return result.data
 
 
 def get_monthly_stats(supabase):
     """Get current month statistics"""
-    today = datetime.now()
-    month_start = today.replace(day=1).strftime('%Y-%m-%d')
+    today = date.today()
+    month_start = today.replace(day=1).isoformat()
     
-    result = supabase.table('daily_summary').select('*').gte('date', month_start).execute()
+    # Only the two totals are summed here, so don't fetch whole rows
+    result = supabase.table('daily_summary').select('total_scheduled,total_heard').gte('date', month_start).execute()
     
     if not result.data:
         return None
@@ -110,31 +118,33 @@ def get_monthly_stats(supabase):
 
 def get_top_judges_monthly(supabase):
     """Get top performing judges for current month"""
-    today = datetime.now()
-    month_start = today.replace(day=1).strftime('%Y-%m-%d')
+    today = date.today()
+    month_start = today.replace(day=1).isoformat()
     
     # Use SQL query for aggregation
     result = supabase.rpc('get_top_judges_month', {'start_date': month_start}).execute()
     
     # Fallback if RPC doesn't exist
     if not result.data:
-        judges = supabase.table('judge_statistics').select('*').gte('date', month_start).execute()
+        judges = supabase.table('judge_statistics').select('judge_name,cases_scheduled,cases_heard').gte('date', month_start).execute()
         
-        from collections import defaultdict
-        judge_agg = defaultdict(lambda: {'scheduled': 0, 'heard': 0})
+        # int default factories run in C, unlike a lambda building a dict per judge
+        scheduled = defaultdict(int)
+        heard = defaultdict(int)
         
         for stat in judges.data:
             judge = stat['judge_name']
-            judge_agg[judge]['scheduled'] += stat['cases_scheduled']
-            judge_agg[judge]['heard'] += stat['cases_heard']
+            scheduled[judge] += stat['cases_scheduled']
+            heard[judge] += stat['cases_heard']
         
         top = []
-        for judge, data in judge_agg.items():
-            efficiency = (data['heard'] / data['scheduled'] * 100) if data['scheduled'] > 0 else 0
+        for judge, judge_scheduled in scheduled.items():
+            judge_heard = heard[judge]
+            efficiency = (judge_heard / judge_scheduled * 100) if judge_scheduled > 0 else 0
             top.append({
                 'judge_name': judge,
-                'total_heard': data['heard'],
-                'total_scheduled': data['scheduled'],
+                'total_heard': judge_heard,
+                'total_scheduled': judge_scheduled,
                 'efficiency': round(efficiency, 2)
             })
         
@@ -151,9 +161,9 @@ def generate_html(latest_date, daily, judges, weekly, monthly, top_judges):
     daily_scheduled = daily['total_scheduled'] if daily else 0
     daily_heard = daily['total_heard'] if daily else 0
     
-    # Generate weekly chart data
-    weekly_dates = [d['date'] for d in weekly] if weekly else []
-    weekly_efficiency = [d['overall_efficiency'] for d in weekly] if weekly else []
+    # Generate weekly chart data (JSON doubles as a JS literal; a Python repr breaks on None)
+    weekly_dates = json.dumps([d['date'] for d in weekly] if weekly else [])
+    weekly_efficiency = json.dumps([d['overall_efficiency'] for d in weekly] if weekly else [])
     
     html = f"""<!DOCTYPE html>
 <html lang="en">
@@ -162,176 +172,7 @@ def generate_html(latest_date, daily, judges, weekly, monthly, top_judges):
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Karnataka High Court - Daily Statistics</title>
     <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }}
-        
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-        }}
-        
-        .header {{
-            background: white;
-            padding: 30px;
-            border-radius: 15px;
-            margin-bottom: 30px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-        }}
-        
-        .header h1 {{
-            color: #2d3748;
-            font-size: 2.5rem;
-            margin-bottom: 10px;
-        }}
-        
-        .header .subtitle {{
-            color: #718096;
-            font-size: 1.1rem;
-        }}
-        
-        .disclaimer {{
-            background: #fff3cd;
-            border-left: 4px solid #ffc107;
-            padding: 15px;
-            margin: 20px 0;
-            border-radius: 5px;
-        }}
-        
-        .disclaimer strong {{
-            color: #856404;
-        }}
-        
-        .stats-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
-            gap: 20px;
-            margin-bottom: 30px;
-        }}
-        
-        .stat-card {{
-            background: white;
-            padding: 25px;
-            border-radius: 15px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-            transition: transform 0.3s ease;
-        }}
-        
-        .stat-card:hover {{
-            transform: translateY(-5px);
-        }}
-        
-        .stat-card .label {{
-            color: #718096;
-            font-size: 0.9rem;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-            margin-bottom: 10px;
-        }}
-        
-        .stat-card .value {{
-            color: #2d3748;
-            font-size: 2.5rem;
-            font-weight: bold;
-            margin-bottom: 5px;
-        }}
-        
-        .stat-card .change {{
-            font-size: 0.9rem;
-            color: #48bb78;
-        }}
-        
-        .chart-container {{
-            background: white;
-            padding: 30px;
-            border-radius: 15px;
-            margin-bottom: 30px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-        }}
-        
-        .chart-container h2 {{
-            color: #2d3748;
-            margin-bottom: 20px;
-        }}
-        
-        .judge-table {{
-            background: white;
-            padding: 30px;
-            border-radius: 15px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-            overflow-x: auto;
-        }}
-        
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-        }}
-        
-        th {{
-            background: #667eea;
-            color: white;
-            padding: 15px;
-            text-align: left;
-            font-weight: 600;
-        }}
-        
-        td {{
-            padding: 15px;
-            border-bottom: 1px solid #e2e8f0;
-        }}
-        
-        tr:hover {{
-            background: #f7fafc;
-        }}
-        
-        .efficiency-bar {{
-            height: 8px;
-            background: #e2e8f0;
-            border-radius: 4px;
-            overflow: hidden;
-        }}
-        
-        .efficiency-fill {{
-            height: 100%;
-            background: linear-gradient(90deg, #48bb78, #38a169);
-            transition: width 0.3s ease;
-        }}
-        
-        .footer {{
-            text-align: center;
-            color: white;
-            margin-top: 30px;
-            padding: 20px;
-        }}
-        
-        .badge {{
-            display: inline-block;
-            padding: 5px 10px;
-            border-radius: 20px;
-            font-size: 0.85rem;
-            font-weight: 600;
-        }}
-        
-        .badge-success {{
-            background: #c6f6d5;
-            color: #22543d;
-        }}
-        
-        .badge-warning {{
-            background: #feebc8;
-            color: #7c2d12;
-        }}
-    </style>
+    <link rel="stylesheet" href="style.css">
 </head>
 <body>
     <div class="container">
@@ -547,4 +388,10 @@ def generate_top_judges_section(top_judges):
 
 
 if __name__ == "__main__":
+    # Configure logging only when run as a script, so importing a module doesn't
+    # open app.log or attach handlers
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s', handlers=[
+        logging.FileHandler('app.log'),  # Creates log file
+        logging.StreamHandler()  # Also logs to console
+    ])
     generate_dashboard()
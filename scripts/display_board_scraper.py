@@ -6,9 +6,11 @@ Scrapes court display board and stores in Supabase
 
 import os
 import sys
+import time
+import signal
 import requests
 from bs4 import BeautifulSoup
-from datetime import datetime, time
+from datetime import datetime
 from supabase import create_client, Client
 import logging
 import httpx
@@ -18,22 +20,33 @@ import httpx
 SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
 DISPLAY_BOARD_URL = "https://judiciary.karnataka.gov.in/display_board_bench.php"
+HTTP_RESPONDER_URL = "https://gthnjueqoufdtwtzjcxg.supabase.co/functions/v1/http-responder"
+SCRAPE_INTERVAL = 30  # Seconds between scrapes in a session
+TICK_TIMEOUT = 120  # Seconds one scrape may run before the watchdog abandons it
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s',
-                    handlers=[
-        logging.FileHandler('app.log'),  # Creates log file
-        logging.StreamHandler()  # Also logs to console
-    ]
-)
 
+_supabase_client = None
+_worker_client = None
 
-def http_worker_call_to_supabase():
-    try:
-        url: str = "https://gthnjueqoufdtwtzjcxg.supabase.co/functions/v1/http-responder"
+def get_supabase_client():
+    """Return the shared Supabase client, creating it on first use"""
+    global _supabase_client
+    if _supabase_client is None:
+        _supabase_client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    return _supabase_client
 
-        supabase: Client = create_client(url, SUPABASE_KEY) #,options={"function_client_timeout": 60,"postgrest_client_timeout": 60})
+def get_worker_client():
+    """Return the shared client for the http-responder Edge Function"""
+    global _worker_client
+    if _worker_client is None:
+        _worker_client = create_client(HTTP_RESPONDER_URL, SUPABASE_KEY) #,options={"function_client_timeout": 60,"postgrest_client_timeout": 60})
+        _worker_client.functions._client.timeout = httpx.Timeout(60.0)
+    return _worker_client
 
-        supabase.functions._client.timeout = httpx.Timeout(60.0)
+
+def http_worker_call_to_supabase():
+    try:
+        supabase: Client = get_worker_client()
         # Invoke the function
         response = supabase.functions.invoke(
             "http-responder", # Name of your Edge Function
@@ -89,59 +102,6 @@ def scrape_display_board():
         logging.error(f"Scraping error: {e}")
         return []
 
-def update_supabase_recordwise(records):
-    """Update Supabase with heard cases"""
-    if not records:
-        logging.info("No records to update")
-        return 0
-    
-    try:
-        supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-        date_str = datetime.now().strftime('%Y-%m-%d')
-        timestamp = datetime.now().isoformat()
-        new_count = 0
-        
-        for record in records:
-            ch_no = record['ch_no']
-            list_no = record['list_no']
-            case_no = record['case_no']
-            
-            # Check if case already exists
-            existing = supabase.table('heard_cases').select('id', 'total_appearances').eq(
-                'date', date_str
-            ).eq('court_hall', ch_no).eq('case_number', case_no).execute()
-            
-            if existing.data:
-                # Update: increment appearances, update last_heard_at
-                case_id = existing.data[0]['id']
-                appearances = existing.data[0]['total_appearances'] + 1
-                
-                supabase.table('heard_cases').update({
-                    'last_heard_at': timestamp,
-                    'total_appearances': appearances,
-                    'updated_at': timestamp
-                }).eq('id', case_id).execute()
-            else:
-                # Insert new case
-                supabase.table('heard_cases').insert({
-                    'date': date_str,
-                    'court_hall': ch_no,
-                    'list_number': list_no,
-                    'case_number': case_no,
-                    'first_heard_at': timestamp,
-                    'last_heard_at': timestamp,
-                    'total_appearances': 1,
-                    'status': 'in_progress'
-                }).execute()
-                new_count += 1
-        
-        logging.info(f"Updated Supabase: {new_count} new cases, {len(records)-new_count} updated")
-        return new_count
-    
-    except Exception as e:
-        logging.error(f"Supabase error: {e}")
-        return 0
-
 def upsert_supabase_batch(records):
     """
     Sends all records in ONE request.
@@ -151,9 +111,11 @@ def upsert_supabase_batch(records):
         return 0
 
     try:
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-        now_iso = datetime.now().isoformat()
-        today_str = datetime.now().strftime('%Y-%m-%d')
+        supabase: Client = get_supabase_client()
+        # One clock read, so the date and timestamp always agree (even across midnight)
+        now = datetime.now()
+        now_iso = now.isoformat()
+        today_str = now.strftime('%Y-%m-%d')
 
         payload = [{
             'date': today_str,
@@ -194,5 +156,45 @@ def main():
         logging.error(f"Supabase Outer Upsert error: {e}")
         return 0
 
+def tick_timeout(signum, frame):
+    """SIGALRM handler: abort a scrape that has hung"""
+    raise TimeoutError(f"scrape took longer than {TICK_TIMEOUT}s")
+
+
+def run_session(duration):
+    """Scrape every SCRAPE_INTERVAL seconds for `duration` seconds, reusing one process and its clients"""
+    end_time = time.monotonic() + duration
+    count = 0
+    # Watchdog: a hung request is interrupted so the next tick still runs
+    signal.signal(signal.SIGALRM, tick_timeout)
+    while time.monotonic() < end_time:
+        count += 1
+        logging.info(f"Scrape #{count}")
+        signal.alarm(TICK_TIMEOUT)
+        try:
+            main()
+        except Exception as e:
+            # One bad tick must not end the session
+            logging.error(f"Scrape #{count} failed: {e}")
+        finally:
+            signal.alarm(0)
+
+        # Sleep unless it's the last iteration
+        if time.monotonic() < end_time:
+            time.sleep(SCRAPE_INTERVAL)
+
+    logging.info(f"Session completed. Total scrapes: {count}")
+
+
 if __name__ == "__main__":
-    main()
+    # Configure logging only when run as a script, so importing a module doesn't
+    # open app.log or attach handlers
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s', handlers=[
+        logging.FileHandler('app.log'),  # Creates log file
+        logging.StreamHandler()  # Also logs to console
+    ])
+    # Optional session length in seconds: keep scraping in this process instead of a single run
+    if len(sys.argv) > 1:
+        run_session(int(sys.argv[1]))
+    else:
+        main()
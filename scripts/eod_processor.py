@@ -13,16 +13,11 @@ import re
 SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s',    handlers=[
-        logging.FileHandler('app.log'),  # Creates log file
-        logging.StreamHandler()  # Also logs to console
-        ])
-
 
-def process_eod(target_date=None):
+def process_eod(target_date=None, client=None):
     """Process end of day statistics"""
     try:
-        supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+        supabase: Client = client or create_client(SUPABASE_URL, SUPABASE_KEY)
         date_str = target_date or datetime.now().strftime('%Y-%m-%d')
         
         logging.info(f"="*60)
@@ -86,11 +81,14 @@ def generate_hall_stats(hall_data):
         heard = stats['heard']
         efficiency = (heard / scheduled * 100) if scheduled > 0 else 0
         
-        logging.info(f"  Court Hall {hall}:")
-        logging.info(f"    Scheduled: {scheduled}")
-        logging.info(f"    Heard: {heard}")
-        logging.info(f"    Not reached: {scheduled - heard}")
-        logging.info(f"    Efficiency: {efficiency:.1f}%")
+        # One record per hall instead of one log call (and file/console write) per line
+        logging.info("\n".join((
+            f"  Court Hall {hall}:",
+            f"    Scheduled: {scheduled}",
+            f"    Heard: {heard}",
+            f"    Not reached: {scheduled - heard}",
+            f"    Efficiency: {efficiency:.1f}%",
+        )))
 
 
 def generate_judge_stats(judge_data):
@@ -105,11 +103,13 @@ def generate_judge_stats(judge_data):
         heard = stats['cases_heard']
         efficiency = stats['hearing_efficiency']
         
-        logging.info(f"  {judge}:")
-        logging.info(f"    Court Hall: {stats['court_hall']}")
-        logging.info(f"    Scheduled: {scheduled}")
-        logging.info(f"    Heard: {heard}")
-        logging.info(f"    Efficiency: {efficiency}%")
+        logging.info("\n".join((
+            f"  {judge}:",
+            f"    Court Hall: {stats['court_hall']}",
+            f"    Scheduled: {scheduled}",
+            f"    Heard: {heard}",
+            f"    Efficiency: {efficiency}%",
+        )))
 
 
 def save_daily_summary(supabase, date_str, scheduled, heard, not_reached, efficiency, scheduled_cases):
@@ -126,7 +126,7 @@ def generate_summary_report(supabase, date_str):
     """Generate a summary report for the day"""
     try:
         # Optimization: Fetch from daily_summary table instead of re-counting tables
-        res = supabase.table('daily_summary').select('*').eq('date', date_str).execute()
+        res = supabase.table('daily_summary').select('total_scheduled,total_heard,total_not_reached,overall_efficiency').eq('date', date_str).execute()
         
         if res.data:
             summary = res.data[0]
@@ -144,13 +144,21 @@ def generate_summary_report(supabase, date_str):
 
 
 if __name__ == "__main__":
+    # Configure logging only when run as a script, so importing a module doesn't
+    # open app.log or attach handlers
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s', handlers=[
+        logging.FileHandler('app.log'),  # Creates log file
+        logging.StreamHandler()  # Also logs to console
+    ])
     import sys
     
     # Allow passing date as argument: python eod_processor.py 2025-01-15
     target_date = sys.argv[1] if len(sys.argv) > 1 else None
     
-    process_eod(target_date)
+    # One client (and HTTP session) for both the EOD RPC and the summary report
+    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+    process_eod(target_date, client=supabase)
     
     # Generate summary report
     date_str = target_date or datetime.now().strftime('%Y-%m-%d')
-    generate_summary_report(create_client(SUPABASE_URL, SUPABASE_KEY), date_str)
+    generate_summary_report(supabase, date_str)